@@ -4,9 +4,10 @@
 from __future__ import annotations  
 
 import sys  
+from array import array  
 from dataclasses import dataclass  
 from pathlib import Path 
-from typing import Dict, List, Sequence, Tuple 
+from typing import Dict, List, Sequence, TextIO, Tuple 
 
 ALLOWED_CHARS = set("UDRL^v><")  # Characters in the puzzle grid.
 BULBS = set("UDRL")  # Characters representing thermometer bulbs.
@@ -30,16 +31,36 @@ DIRECTION_NAMES: Dict[str, str] = {  #Names for ASP consumers.
     "L": "left",  
     "<": "left",  
 }
+OUTPUT_BUFFER_SIZE = 1 << 18  # 256 KiB write buffer for the facts file instead of the 8 KiB default.
+DIRECTION_ORDER = ("up", "down", "right", "left")  # Arrows get codes 1-4 in this order; 0 marks non-grid bytes.
+BULB_CODE_OFFSET = len(DIRECTION_ORDER)  # A bulb's code is its direction's arrow code plus this offset.
+
+
+def _symbol_code(char: str) -> int:  # Canonical small-integer code of a grid symbol.
+    name = DIRECTION_NAMES.get(char)  
+    if name is None:  
+        return 0  
+    code = DIRECTION_ORDER.index(name) + 1  
+    return code + BULB_CODE_OFFSET if char in BULBS else code  
+
+
+SYMBOL_CODES = bytes(_symbol_code(chr(value)) for value in range(256))  # bytes.translate table from byte value to code.
+BULB_INFO_BY_CODE: Dict[int, Tuple[Tuple[int, int], str]] = {  # Bulb step direction and orientation label keyed by bulb code.
+    _symbol_code(char): (DIRECTION_DELTAS[char], DIRECTION_NAMES[char]) for char in BULBS
+}
 
 
 @dataclass 
 class Thermometer:
     """Representation of a single thermometer"""
 
+    __slots__ = ("bulb_row", "bulb_col", "direction", "cell_rows", "cell_cols")  # Fixed attribute slots instead of a per-instance __dict__.
+
     bulb_row: int  
     bulb_col: int  
     direction: str  # Orientation label 
-    cells: List[Tuple[int, int, int]]  # Ordered list of (index, row, col) tuples for the thermometer cells.
+    cell_rows: array  # Rows of the thermometer cells in order; the 1-based index is implicit.
+    cell_cols: array  # Columns of the thermometer cells, parallel to cell_rows.
 
 
 def main(argv: Sequence[str]) -> int:  
@@ -72,12 +93,12 @@ def main(argv: Sequence[str]) -> int:
         return 1 
 
     thermometers = extract_thermometers(grid)  # Collection of thermometers with ordered cells.
-    content = render_facts(grid, column_targets, row_targets, thermometers)  # Puzzle data into ASP fact text.
 
     if output_path is None:  
-        sys.stdout.write(content)  # Emit the generated facts to the standard output stream.
+        render_facts(sys.stdout, grid, column_targets, row_targets, thermometers)  # Emit the generated facts to the standard output stream.
     else:
-        output_path.write_text(content, encoding="utf-8")  # Persist the generated ASP facts to the chosen file.
+        with open(output_path, "w", encoding="ascii", buffering=OUTPUT_BUFFER_SIZE) as out:  # Persist the generated ASP facts to the chosen file.
+            render_facts(out, grid, column_targets, row_targets, thermometers)  
     return 0  
 
 
@@ -88,17 +109,22 @@ def parse_instance(path: Path) -> Tuple[List[str], List[int], List[int]]:  # Par
         raise ValueError(f"input file '{path}' does not exist")  #  missing.
 
     try:
-        raw_lines = path.read_text(encoding="utf-8").splitlines()  # Load file content and split into lines.
+        data = path.read_bytes()  # Load the whole file without the text I/O layer.
     except OSError as exc:  
         raise ValueError(f"cannot read '{path}': {exc}") from exc  
 
+    try:
+        raw_lines = data.decode("ascii").splitlines()  # Puzzle files are plain ASCII; decode once and split into lines.
+    except UnicodeDecodeError as exc:  
+        raise ValueError(f"cannot decode '{path}' as ASCII: {exc}") from exc  
+
     grid_lines: List[str] = []  # Grid rows encountered in the file.
     number_lines: List[str] = []  # Numeric target lines found at the end.
     for raw in raw_lines:  
         line = raw.strip()  
         if not line:  # Skip empty lines 
             continue  # Continue when encountering blanks.
-        if set(line) <= ALLOWED_CHARS:  # Line contains only valid grid characters.
+        if set(line) <= ALLOWED_CHARS:  # Line contains only valid grid characters; this is the grid's character check.
             grid_lines.append(line)  
         else:
             number_lines.append(line)  
@@ -107,12 +133,8 @@ def parse_instance(path: Path) -> Tuple[List[str], List[int], List[int]]:  # Par
         raise ValueError("input grid is empty")  # The puzzle lacks a grid.
 
     size = len(grid_lines)  # Grid rows.
-    for row in grid_lines: 
-        if len(row) != size:  
-            raise ValueError("grid is not square")  
-        for char in row:  
-            if char not in ALLOWED_CHARS:  # Confirm only permitted symbols appear in the grid.
-                raise ValueError(f"invalid character '{char}' in grid")  
+    if any(len(row) != size for row in grid_lines):  # Stops at the first row of the wrong length.
+        raise ValueError("grid is not square")  
 
     if len(number_lines) != 2:  # Two lines remain for column and row targets.
         raise ValueError("expected two lines with column and row targets")  
@@ -142,115 +164,106 @@ def extract_thermometers(grid: Sequence[str]) -> List[Thermometer]:
     """Group grid cells into ordered thermometers starting from their bulbs."""
 
     size = len(grid)  
-    visited = [[False] * size for _ in range(size)]  
+    codes = "".join(grid).encode("ascii").translate(SYMBOL_CODES)  # Flat grid of symbol codes; cell (r, c) lives at r * size + c.
+    visited = bytearray(size * size)  # Flat visited flags, indexed like codes.
     thermometers: List[Thermometer] = [] 
-
-    for row in range(size):  
-        for col in range(size):  
-            char = grid[row][col]  # Fetch the symbol stored at the current cell.
-            if char in BULBS and not visited[row][col]:  # Encountering a new bulb cell.
-                direction = DIRECTION_DELTAS[char]  # Delta associated with the bulb.
-                direction_name = DIRECTION_NAMES[char]  # Record the readable orientation 
-                cells: List[Tuple[int, int, int]] = []  # Store ordered cells belonging to this thermometer.
-
-                current_row, current_col = row, col  # Traversal coordinates at the bulb location.
-                index = 1  # Ordinal index
-                while True:  # Follow the thermometer
-                    if visited[current_row][current_col]:  # Detect overlapping thermometers 
-                        raise ValueError( 
-                            "grid contains overlapping thermometers at "
-                            f"({current_row},{current_col})"
-                        )
-
-                    visited[current_row][current_col] = True  # Current cell belonging to this thermometer.
-                    cells.append((index, current_row, current_col)) 
-
-                    next_row = current_row + direction[0] 
-                    next_col = current_col + direction[1]  
-                    if not (0 <= next_row < size and 0 <= next_col < size):  # Stop if the next position exits the grid.
-                        break  
-
-                    next_char = grid[next_row][next_col]  # Inspect the symbol at the prospective next cell.
-                    if next_char in BULBS:  # Encountering another bulb signals the start of a different thermometer.
-                        break  
-                    if DIRECTION_DELTAS.get(next_char) != direction:  # Stop when the chain no longer continues straight.
-                        break  
-                    current_row, current_col = next_row, next_col  # Advance to the next cell within the thermometer.
-                    index += 1  
-
-                thermometers.append(  
-                    Thermometer(
-                        bulb_row=row,  
-                        bulb_col=col, 
-                        direction=direction_name,  
-                        cells=cells,  # Ordered list of thermometer cells.
+    visited_count = 0  # Cells claimed by thermometers so far.
+
+    for position, code in enumerate(codes):  # Walk the code grid directly; each item is a small integer.
+        if code > BULB_CODE_OFFSET and not visited[position]:  # Encountering a new bulb cell.
+            row, col = divmod(position, size)  # Bulb coordinates, only needed once a thermometer starts.
+            direction, direction_name = BULB_INFO_BY_CODE[code]  # Delta and readable orientation of the bulb.
+            arrow_code = code - BULB_CODE_OFFSET  # Code every further cell of this thermometer must carry.
+            cell_rows = array("H")  # Store ordered rows belonging to this thermometer.
+            cell_cols = array("H")  # Matching columns, kept parallel to cell_rows.
+
+            current_row, current_col = row, col  # Traversal coordinates at the bulb location.
+            while True:  # Follow the thermometer
+                current = current_row * size + current_col  # Flat index of the traversal cell.
+                if visited[current]:  # Detect overlapping thermometers 
+                    raise ValueError( 
+                        "grid contains overlapping thermometers at "
+                        f"({current_row},{current_col})"
                     )
-                )
 
-    for row in range(size):  
-        for col in range(size):  
-            if not visited[row][col]:  # Detect cells never assigned to a thermometer.
-                raise ValueError(  
-                    "found a grid cell that does not belong to any thermometer "
-                    f"at ({row},{col})"
+                visited[current] = 1  # Current cell belonging to this thermometer.
+                cell_rows.append(current_row)  
+                cell_cols.append(current_col)  
+
+                next_row = current_row + direction[0] 
+                next_col = current_col + direction[1]  
+                if not (0 <= next_row < size and 0 <= next_col < size):  # Stop if the next position exits the grid.
+                    break  
+
+                if codes[next_row * size + next_col] != arrow_code:  # Stop at another bulb or when the chain no longer continues straight.
+                    break  
+                current_row, current_col = next_row, next_col  # Advance to the next cell within the thermometer.
+
+            visited_count += len(cell_rows)  
+            thermometers.append(  
+                Thermometer(
+                    bulb_row=row,  
+                    bulb_col=col, 
+                    direction=direction_name,  
+                    cell_rows=cell_rows,  # Ordered thermometer cells.
+                    cell_cols=cell_cols,  
                 )
+            )
+
+    if visited_count != size * size:  # Some cell was never assigned to a thermometer.
+        row, col = divmod(visited.index(0), size)  # Locate the first such cell only on this error path.
+        raise ValueError(  
+            "found a grid cell that does not belong to any thermometer "
+            f"at ({row},{col})"
+        )
     return thermometers 
 
 def render_facts(
+    out: TextIO,  
     grid: Sequence[str],  
     column_targets: Sequence[int],  
     row_targets: Sequence[int],  
     thermometers: Sequence[Thermometer],  
-) -> str:
-    """Generate ASP facts describing the puzzle instance and return them as text."""
+) -> None:
+    """Write ASP facts describing the puzzle instance to ``out`` block by block."""
 
     size = len(grid)  
-    lines: List[str] = []  
-
-    lines.append(f"#const n={size}.")  # Constant with the board dimension-
-    lines.append("")  
-
-    for row in range(size):  
-        lines.append(f"row({row}).")  
-    lines.append("")  
-    for col in range(size): 
-        lines.append(f"col({col}).")  
-    lines.append("") 
-    for row in range(size):  
-        for col in range(size):  
-            lines.append(f"cell({row},{col}).") 
-    lines.append("")  
-
-    for index, value in enumerate(column_targets): 
-        lines.append(f"col_target({index},{value}).")  
-    
-    lines.append("")  
 
-    for index, value in enumerate(row_targets): 
-        lines.append(f"row_target({index},{value}).")  
-    
-    lines.append("")  
+    indices = range(size)  
+    out.write(  # Board constant, rows, columns and cells as one blank-line separated block.
+        "\n\n".join(
+            (
+                f"#const n={size}.",  # Constant with the board dimension-
+                "\n".join(f"row({row})." for row in indices),  
+                "\n".join(f"col({col})." for col in indices),  
+                "\n".join(f"cell({row},{col})." for row in indices for col in indices),  
+                "",  
+            )
+        )
+    )
+
+    out.write(  # Column and row targets, each block joined over its (index, value) pairs.
+        "\n".join(f"col_target({index},{value})." for index, value in enumerate(column_targets))
+        + "\n\n"
+        + "\n".join(f"row_target({index},{value})." for index, value in enumerate(row_targets))
+        + "\n"
+    )
 
     for thermo in thermometers: 
-        bulb_row = thermo.bulb_row  
-        bulb_col = thermo.bulb_col  
-        direction = thermo.direction  
-        cell_list = list(thermo.cells)  
-
-        lines.append(f"thermometer({bulb_row},{bulb_col}).")  # Thermometer via its bulb coordinates.
-        lines.append(f"thermo_dir({bulb_row},{bulb_col},{direction}).")  # Thermometer's orientation.
-        lines.append(  # Store the total number of cells in the thermometer.
-            f"thermo_length({bulb_row},{bulb_col},{len(cell_list)})."
-        )
+        bulb = f"{thermo.bulb_row},{thermo.bulb_col}"  # Bulb coordinates formatted once and reused by every fact.
 
-        for order, row, col in cell_list:  
-            lines.append(  
-                f"thermo_cell({bulb_row},{bulb_col},{order},{row},{col})."
+        out.write(  # Blank separator, then bulb coordinates, orientation and total number of cells in one write.
+            f"\nthermometer({bulb}).\n"
+            f"thermo_dir({bulb},{thermo.direction}).\n"
+            f"thermo_length({bulb},{len(thermo.cell_rows)}).\n"
+        )
+        out.write(  # Ordered cells of the thermometer as a single block.
+            "\n".join(
+                f"thermo_cell({bulb},{order},{row},{col})."
+                for order, (row, col) in enumerate(zip(thermo.cell_rows.tolist(), thermo.cell_cols.tolist()), 1)
             )
-        lines.append("")  
-
-    output_content = "\n".join(lines).rstrip() + "\n"  # Combine lines, trim trailing blank lines, and ensure newline termination.
-    return output_content 
+        )
+        out.write("\n")  # Terminate the block; the next one opens with its own separator.
 
 
 if __name__ == "__main__":  